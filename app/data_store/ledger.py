@@ -0,0 +1,67 @@
+from typing import Iterable, Tuple
+
+
+class PositionLedger:
+    """
+    Per-symbol position built from a stream of fills.
+
+    Quantities are signed (buy > 0, sell < 0). Average cost and realized PnL
+    are updated in O(1) per fill, so PnL queries never replay the fill history.
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.quantity: int = 0
+        self.avg_price: float = 0.0
+        self.realized_pnl: float = 0.0
+        self.fill_count: int = 0
+
+    def apply_fill(self, price: float, quantity: int):
+        """Apply a single fill. Positive quantity is a buy, negative is a sell."""
+        if quantity == 0:
+            return
+        if price <= 0:
+            raise ValueError(f"Invalid fill price for {self.symbol}: {price}")
+
+        position = self.quantity
+        if position == 0 or (position > 0) == (quantity > 0):
+            # Opening or adding to the position -> blend average cost
+            new_position = position + quantity
+            self.avg_price = (
+                self.avg_price * abs(position) + price * abs(quantity)
+            ) / abs(new_position)
+            self.quantity = new_position
+        else:
+            # Reducing, closing or flipping the position
+            closed = min(abs(quantity), abs(position))
+            direction = 1 if position > 0 else -1
+            self.realized_pnl += (price - self.avg_price) * closed * direction
+            self.quantity = position + quantity
+            if self.quantity == 0:
+                self.avg_price = 0.0
+            elif (self.quantity > 0) != (position > 0):
+                # Flipped through zero -> remainder opens at the fill price
+                self.avg_price = price
+
+        self.fill_count += 1
+
+    def apply_fills(self, fills: Iterable[Tuple[float, int]]):
+        """Bulk apply (price, signed quantity) fills in order"""
+        for price, quantity in fills:
+            self.apply_fill(price, quantity)
+
+    def unrealized_pnl(self, ltp: float) -> float:
+        return (ltp - self.avg_price) * self.quantity
+
+    def total_pnl(self, ltp: float) -> float:
+        return self.realized_pnl + self.unrealized_pnl(ltp)
+
+    def to_dict(self, ltp: float) -> dict:
+        return {
+            "symbol": self.symbol,
+            "quantity": self.quantity,
+            "avg_price": self.avg_price,
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl(ltp),
+            "fill_count": self.fill_count,
+        }
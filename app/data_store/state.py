@@ -2,6 +2,8 @@ import asyncio
 from typing import Dict, List, Optional
 from collections import deque
 from datetime import datetime
+from app.data_store.ledger import PositionLedger
+from app.data_store.tick_history import TickHistory
 
 class DataStore:
     def __init__(self):
@@ -15,8 +17,25 @@ class DataStore:
         self.locks: Dict[str, asyncio.Lock] = {}
         self.tick_tasks: Dict[str, asyncio.Task] = {}
         self.csv_data: Dict[str, List[dict]] = {}
+        self.ledgers: Dict[str, PositionLedger] = {}
+        self.tick_history = TickHistory()
         
     def add_instrument(self, symbol: str, entry_price: float, quantity: int):
+        """Load an instrument; reloading a known symbol sets a fresh opening position"""
+        # Opening position is the first fill; build it before touching state
+        ledger = PositionLedger(symbol)
+        ledger.apply_fill(entry_price, quantity)
+
+        if symbol in self.ledgers:
+            # Idempotent reload: replace the position, keep LTP, buffers and the
+            # lock a tick task may be holding. Incremental changes go through fills.
+            self.ledgers[symbol] = ledger
+            self.instruments[symbol] = {
+                "entry_price": entry_price,
+                "quantity": quantity
+            }
+            return
+
         self.instruments[symbol] = {
             "entry_price": entry_price,
             "quantity": quantity
@@ -27,12 +46,26 @@ class DataStore:
         self.volume_buffers[symbol] = deque(maxlen=50)
         self.indicator_cache[symbol] = {}
         self.locks[symbol] = asyncio.Lock()
-        
+        self.ledgers[symbol] = ledger
+
+    def apply_fill(self, symbol: str, price: float, quantity: int):
+        """Apply a signed fill, opening a flat instrument if symbol is unknown"""
+        if symbol not in self.instruments:
+            self.add_instrument(symbol, price, 0)
+        ledger = self.ledgers[symbol]
+        ledger.apply_fill(price, quantity)
+        # Keep the instrument view in sync with the ledger
+        self.instruments[symbol]["entry_price"] = ledger.avg_price
+        self.instruments[symbol]["quantity"] = ledger.quantity
+
+    def get_position(self, symbol: str) -> Optional[dict]:
+        if symbol not in self.ledgers or symbol not in self.ltp_cache:
+            return None
+        return self.ledgers[symbol].to_dict(self.ltp_cache[symbol])
+
     def get_pnl(self, symbol: str) -> Optional[float]:
-        if symbol not in self.instruments or symbol not in self.ltp_cache:
+        if symbol not in self.ledgers or symbol not in self.ltp_cache:
             return None
-        inst = self.instruments[symbol]
-        current_price = self.ltp_cache[symbol]
-        return (current_price - inst["entry_price"]) * inst["quantity"]
+        return self.ledgers[symbol].total_pnl(self.ltp_cache[symbol])
 
 store = DataStore()
@@ -0,0 +1,360 @@
+import struct
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# (timestamp, price, volume)
+Tick = Tuple[float, float, int]
+
+_MASK64 = (1 << 64) - 1
+
+# Delta-of-delta buckets: (prefix bits, prefix length, value bits)
+_BUCKETS = (
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12),
+    (0b11110, 5, 32),
+)
+
+
+def _float_to_bits(value: float) -> int:
+    return struct.unpack(">Q", struct.pack(">d", value))[0]
+
+
+def _bits_to_float(bits: int) -> float:
+    return struct.unpack(">d", struct.pack(">Q", bits))[0]
+
+
+class BitWriter:
+    """Append-only bit stream backed by a bytearray"""
+
+    __slots__ = ("buf", "_cur", "_cur_bits")
+
+    def __init__(self):
+        self.buf = bytearray()
+        self._cur = 0
+        self._cur_bits = 0
+
+    def write(self, value: int, nbits: int):
+        self._cur = (self._cur << nbits) | (value & ((1 << nbits) - 1))
+        self._cur_bits += nbits
+        while self._cur_bits >= 8:
+            self._cur_bits -= 8
+            self.buf.append((self._cur >> self._cur_bits) & 0xFF)
+        self._cur &= (1 << self._cur_bits) - 1
+
+    def getvalue(self) -> bytes:
+        """Bytes written so far, last partial byte zero-padded"""
+        if self._cur_bits == 0:
+            return bytes(self.buf)
+        return bytes(self.buf) + bytes([(self._cur << (8 - self._cur_bits)) & 0xFF])
+
+
+class BitReader:
+    __slots__ = ("data", "_pos", "_cur", "_cur_bits")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self._pos = 0
+        self._cur = 0
+        self._cur_bits = 0
+
+    def read(self, nbits: int) -> int:
+        while self._cur_bits < nbits:
+            self._cur = (self._cur << 8) | self.data[self._pos]
+            self._pos += 1
+            self._cur_bits += 8
+        self._cur_bits -= nbits
+        value = self._cur >> self._cur_bits
+        self._cur &= (1 << self._cur_bits) - 1
+        return value
+
+    def read_bit(self) -> int:
+        return self.read(1)
+
+
+def _write_signed(writer: BitWriter, value: int):
+    """Variable-length signed integer ('0' for zero, bucketed otherwise)"""
+    if value == 0:
+        writer.write(0, 1)
+        return
+    for prefix, prefix_len, nbits in _BUCKETS:
+        bound = 1 << (nbits - 1)
+        if -bound <= value < bound:
+            writer.write(prefix, prefix_len)
+            writer.write(value, nbits)
+            return
+    writer.write(0b11111, 5)
+    writer.write(value, 64)
+
+
+def _read_signed(reader: BitReader) -> int:
+    if reader.read_bit() == 0:
+        return 0
+    nbits = 64
+    for _, _, bucket_bits in _BUCKETS:
+        if reader.read_bit() == 0:
+            nbits = bucket_bits
+            break
+    value = reader.read(nbits)
+    if value >= 1 << (nbits - 1):
+        value -= 1 << nbits
+    return value
+
+
+class _XorState:
+    __slots__ = ("prev", "leading", "trailing")
+
+    def __init__(self, first_bits: int):
+        self.prev = first_bits
+        self.leading = -1
+        self.trailing = 0
+
+
+def _write_xor(writer: BitWriter, state: _XorState, bits: int):
+    xor = bits ^ state.prev
+    state.prev = bits
+    if xor == 0:
+        writer.write(0, 1)
+        return
+    writer.write(1, 1)
+    leading = min(64 - xor.bit_length(), 31)
+    trailing = (xor & -xor).bit_length() - 1
+    if state.leading != -1 and leading >= state.leading and trailing >= state.trailing:
+        # Meaningful bits fit inside the previous window
+        writer.write(0, 1)
+        writer.write(xor >> state.trailing, 64 - state.leading - state.trailing)
+        return
+    meaningful = 64 - leading - trailing
+    writer.write(1, 1)
+    writer.write(leading, 5)
+    writer.write(meaningful & 0x3F, 6)  # 64 is stored as 0
+    writer.write(xor >> trailing, meaningful)
+    state.leading = leading
+    state.trailing = trailing
+
+
+def _read_xor(reader: BitReader, state: _XorState) -> int:
+    if reader.read_bit() == 0:
+        return state.prev
+    if reader.read_bit() == 1:
+        state.leading = reader.read(5)
+        meaningful = reader.read(6) or 64
+        state.trailing = 64 - state.leading - meaningful
+    meaningful = 64 - state.leading - state.trailing
+    state.prev ^= reader.read(meaningful) << state.trailing
+    return state.prev
+
+
+class Chunk:
+    """
+    Gorilla-style compressed block of ticks.
+
+    Timestamps are stored as milliseconds with delta-of-delta encoding, prices
+    as XOR against the previous float64 and volumes as bucketed deltas. The
+    first tick of a chunk is written raw so every chunk decodes on its own.
+
+    Readers may run in the threadpool while the tick loop appends, so they only
+    use `_view`: (buffer, flushed bytes, tail bits value, tail bit count, count),
+    replaced in a single assignment after each append. The buffer only grows,
+    so its flushed prefix never changes under a reader.
+    """
+
+    __slots__ = (
+        "start_ts", "end_ts", "count", "_writer", "_view",
+        "_prev_ms", "_prev_delta", "_prev_volume", "_xor",
+    )
+
+    def __init__(self):
+        self.start_ts: Optional[float] = None
+        self.end_ts: Optional[float] = None
+        self.count = 0
+        self._writer: Optional[BitWriter] = BitWriter()
+        self._view: tuple = (b"", 0, 0, 0, 0)
+        self._prev_ms = 0
+        self._prev_delta = 0
+        self._prev_volume = 0
+        self._xor: Optional[_XorState] = None
+
+    def append(self, timestamp: float, price: float, volume: int):
+        writer = self._writer
+        ms = int(round(timestamp * 1000))
+        price_bits = _float_to_bits(price)
+        if self.count == 0:
+            writer.write(ms & _MASK64, 64)
+            writer.write(price_bits, 64)
+            writer.write(volume & _MASK64, 64)
+            self._xor = _XorState(price_bits)
+            self.start_ts = ms / 1000.0
+        else:
+            delta = ms - self._prev_ms
+            _write_signed(writer, delta - self._prev_delta)
+            _write_xor(writer, self._xor, price_bits)
+            _write_signed(writer, volume - self._prev_volume)
+            self._prev_delta = delta
+        self._prev_ms = ms
+        self._prev_volume = volume
+        # Bounds use the stored (millisecond) value so pruning agrees with decoding
+        self.end_ts = ms / 1000.0
+        self.count += 1
+        self._view = (writer.buf, len(writer.buf), writer._cur, writer._cur_bits, self.count)
+
+    def seal(self):
+        """Freeze the chunk, dropping encoder state"""
+        data = self._writer.getvalue()
+        self._view = (data, len(data), 0, 0, self.count)
+        self._writer = None
+        self._xor = None
+
+    @property
+    def nbytes(self) -> int:
+        _, nbytes, _, tail_bits, _ = self._view
+        return nbytes + (1 if tail_bits else 0)
+
+    def __iter__(self) -> Iterator[Tick]:
+        buf, nbytes, tail, tail_bits, count = self._view
+        if count == 0:
+            return
+        data = bytes(buf[:nbytes])
+        if tail_bits:
+            data += bytes([(tail << (8 - tail_bits)) & 0xFF])
+        reader = BitReader(data)
+        ms = reader.read(64)
+        if ms >= 1 << 63:
+            ms -= 1 << 64
+        state = _XorState(reader.read(64))
+        volume = reader.read(64)
+        if volume >= 1 << 63:
+            volume -= 1 << 64
+        yield ms / 1000.0, _bits_to_float(state.prev), volume
+
+        delta = 0
+        for _ in range(count - 1):
+            delta += _read_signed(reader)
+            ms += delta
+            price_bits = _read_xor(reader, state)
+            volume += _read_signed(reader)
+            yield ms / 1000.0, _bits_to_float(price_bits), volume
+
+
+class SymbolHistory:
+    """Time-ordered chunk list for a single symbol"""
+
+    def __init__(self, chunk_size: int = 1024):
+        self.chunk_size = chunk_size
+        self.chunks: List[Chunk] = [Chunk()]
+        self._starts: List[float] = []
+        self.last_timestamp: Optional[float] = None
+        self.dropped = 0
+
+    def append(self, timestamp: float, price: float, volume: int) -> bool:
+        """Append a tick; ticks older than the last stored one are dropped and counted"""
+        stored_ts = int(round(timestamp * 1000)) / 1000.0
+        if self.last_timestamp is not None and stored_ts < self.last_timestamp:
+            self.dropped += 1
+            return False
+        head = self.chunks[-1]
+        if head.count >= self.chunk_size:
+            head.seal()
+            head = Chunk()
+            self.chunks.append(head)
+        head.append(timestamp, price, volume)
+        if head.count == 1:
+            self._starts.append(head.start_ts)
+        self.last_timestamp = head.end_ts
+        return True
+
+    def __len__(self) -> int:
+        return sum(c.count for c in self.chunks)
+
+    def _first_chunk(self, start: Optional[float]) -> int:
+        if start is None:
+            return 0
+        # Step back one chunk: ticks equal to start may straddle a boundary
+        return max(bisect_left(self._starts, start) - 1, 0)
+
+    def iter_ticks(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[Tick]:
+        for chunk in self.chunks[self._first_chunk(start):]:
+            if end is not None and chunk.start_ts is not None and chunk.start_ts > end:
+                return
+            for tick in chunk:
+                if start is not None and tick[0] < start:
+                    continue
+                if end is not None and tick[0] > end:
+                    return
+                yield tick
+
+    def ticks_until_closest(self, timestamp: float, lookback: int = 50) -> List[Tick]:
+        """
+        Last `lookback` ticks ending at the tick closest to timestamp. Like the
+        CSV snapshot scan, the first tick with the minimum distance wins (earlier
+        tick on ties, first of repeated timestamps). Decoding starts just far
+        enough before the target chunk to fill the lookback window, so older
+        history is never touched.
+        """
+        idx = self._first_chunk(timestamp)
+        preceding = 0
+        while idx > 0 and preceding < lookback:
+            idx -= 1
+            preceding += self.chunks[idx].count
+        window: deque = deque(maxlen=lookback)
+        # Ticks after the current best that only tie it (repeated timestamps)
+        pending: List[Tick] = []
+        best_diff = float("inf")
+        for chunk in self.chunks[idx:]:
+            for tick in chunk:
+                diff = abs(tick[0] - timestamp)
+                if diff < best_diff:
+                    window.extend(pending)
+                    pending.clear()
+                    window.append(tick)
+                    best_diff = diff
+                elif tick[0] > timestamp:
+                    return list(window)
+                else:
+                    pending.append(tick)
+        return list(window)
+
+
+class TickHistory:
+    """Compressed long-horizon tick history for all symbols"""
+
+    def __init__(self, chunk_size: int = 1024):
+        self.chunk_size = chunk_size
+        self.symbols: Dict[str, SymbolHistory] = {}
+
+    def append(self, symbol: str, timestamp: float, price: float, volume: int) -> bool:
+        if symbol not in self.symbols:
+            self.symbols[symbol] = SymbolHistory(self.chunk_size)
+        history = self.symbols[symbol]
+        stored = history.append(timestamp, price, volume)
+        if not stored and history.dropped == 1:
+            print(f"Tick history for {symbol}: dropping out-of-order tick at {timestamp} "
+                  f"(last stored {history.last_timestamp})")
+        return stored
+
+    def last_timestamp(self, symbol: str) -> Optional[float]:
+        if symbol not in self.symbols:
+            return None
+        return self.symbols[symbol].last_timestamp
+
+    def iter_ticks(self, symbol: str, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[Tick]:
+        if symbol not in self.symbols:
+            return iter(())
+        return self.symbols[symbol].iter_ticks(start, end)
+
+    def ticks_until_closest(self, symbol: str, timestamp: float, lookback: int = 50) -> List[Tick]:
+        if symbol not in self.symbols:
+            return []
+        return self.symbols[symbol].ticks_until_closest(timestamp, lookback)
+
+    def stats(self) -> dict:
+        ticks = sum(len(h) for h in self.symbols.values())
+        nbytes = sum(c.nbytes for h in self.symbols.values() for c in h.chunks)
+        return {
+            "symbols": len(self.symbols),
+            "ticks": ticks,
+            "bytes": nbytes,
+            "bytes_per_tick": nbytes / ticks if ticks else None,
+            "dropped": {s: h.dropped for s, h in self.symbols.items() if h.dropped},
+        }
@@ -1,11 +1,21 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 
 class Instrument(BaseModel):
     symbol: str
-    entry_price: float
+    entry_price: float = Field(gt=0)
     quantity: int
 
+class Fill(BaseModel):
+    symbol: str
+    side: Literal["buy", "sell"]
+    price: float = Field(gt=0)
+    quantity: int = Field(gt=0)
+
+    @property
+    def signed_quantity(self) -> int:
+        return self.quantity if self.side == "buy" else -self.quantity
+
 class SubscribeRequest(BaseModel):
     symbols: List[str]
     mode: str = "simulation"
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from typing import List
-from app.models import Instrument
+from app.models import Instrument, Fill
 from app.data_store.state import store
 
 router = APIRouter(prefix="/instruments", tags=["instruments"])
 
 @router.post("/load")
-def load_instruments(instruments: List[Instrument]):
-    """Bulk load instruments"""
+async def load_instruments(instruments: List[Instrument]):
+    """Bulk load instruments (async so ledger updates run on the tick loop, like /fills)"""
     for inst in instruments:
         store.add_instrument(inst.symbol, inst.entry_price, inst.quantity)
     return {"message": f"Loaded {len(instruments)} instruments", "symbols": [i.symbol for i in instruments]}
@@ -16,3 +16,20 @@ def load_instruments(instruments: List[Instrument]):
 def list_instruments():
     """List all loaded instruments"""
     return {"instruments": store.instruments}
+
+@router.post("/fills")
+async def load_fills(fills: List[Fill]):
+    """Bulk import fills (executions) into the per-symbol position ledgers"""
+    # Price/quantity are validated on the Fill model, so the batch is checked before any fill applies
+    for fill in fills:
+        store.apply_fill(fill.symbol, fill.price, fill.signed_quantity)
+    symbols = sorted({f.symbol for f in fills})
+    return {
+        "message": f"Applied {len(fills)} fills",
+        "positions": {s: store.get_position(s) for s in symbols},
+    }
+
+@router.get("/positions")
+def list_positions():
+    """List ledger positions with realized/unrealized PnL"""
+    return {"positions": {s: store.get_position(s) for s in store.ledgers}}
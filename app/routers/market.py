@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
 from typing import Optional
 from app.models import SubscribeRequest, IndicatorsResponse, SnapshotResponse
 from app.data_store.state import store
@@ -76,15 +76,17 @@ def get_price(symbol: str):
 @router.get("/pnl/{symbol}")
 def get_pnl(symbol: str):
     """Get PnL for a symbol"""
-    pnl = store.get_pnl(symbol)
-    if pnl is None:
+    position = store.get_position(symbol)
+    if position is None:
         raise HTTPException(status_code=404, detail="Symbol not found")
     return {
         "symbol": symbol,
-        "pnl": pnl,
-        "entry_price": store.instruments[symbol]["entry_price"],
+        "pnl": position["realized_pnl"] + position["unrealized_pnl"],
+        "entry_price": position["avg_price"],
         "current_price": store.ltp_cache[symbol],
-        "quantity": store.instruments[symbol]["quantity"],
+        "quantity": position["quantity"],
+        "realized_pnl": position["realized_pnl"],
+        "unrealized_pnl": position["unrealized_pnl"],
     }
 
 
@@ -113,6 +115,30 @@ def get_indicators(symbol: str):
     }
 
 
+@router.get("/history/{symbol}")
+def get_history(
+    symbol: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    """Get recorded ticks for a symbol from the compressed tick history"""
+    if symbol not in store.tick_history.symbols:
+        raise HTTPException(status_code=404, detail="No history for symbol")
+    ticks = []
+    for ts, price, volume in store.tick_history.iter_ticks(symbol, start, end):
+        if len(ticks) >= limit:
+            break
+        ticks.append({"timestamp": ts, "price": price, "volume": volume})
+    return {"symbol": symbol, "count": len(ticks), "ticks": ticks}
+
+
+@router.get("/history-stats")
+def get_history_stats():
+    """Compression stats of the tick history store"""
+    return store.tick_history.stats()
+
+
 @router.get("/snapshot/{symbol}")
 def get_snapshot(symbol: str, timestamp: Optional[float] = None):
     """
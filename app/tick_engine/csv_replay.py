@@ -74,7 +74,11 @@ async def replay_csv_ticks(symbol: str, store):
         return
     
     print(f"Starting CSV replay for {symbol} with {len(store.csv_data[symbol])} ticks")
-    
+
+    # Re-subscribing replays the CSV from the start; ticks at or before what the
+    # tick history already holds are replayed live but not recorded again
+    recorded_until = store.tick_history.last_timestamp(symbol)
+
     for tick in store.csv_data[symbol]:
         if symbol not in store.subscriptions:
             break
@@ -84,6 +88,8 @@ async def replay_csv_ticks(symbol: str, store):
             store.timestamps[symbol] = tick["timestamp"]
             store.price_buffers[symbol].append(tick["price"])
             store.volume_buffers[symbol].append(tick["volume"])
+            if recorded_until is None or tick["timestamp"] > recorded_until:
+                store.tick_history.append(symbol, tick["timestamp"], tick["price"], tick["volume"])
             update_indicators(symbol, store)
         
         await asyncio.sleep(0.1)
@@ -121,9 +127,10 @@ def get_snapshot_at_timestamp(symbol: str, timestamp: float, store) -> dict:
     """
     Get snapshot (LTP + indicators) for the tick closest to a timestamp from CSV data.
     Ye function ab sirf price nahi, balki us point tak ka full indicator state bhi banata hai.
+    CSV data na ho to compressed live tick history se snapshot banta hai.
     """
     if symbol not in store.csv_data:
-        return None
+        return get_history_snapshot_at_timestamp(symbol, timestamp, store)
 
     ticks = store.csv_data[symbol]
     if not ticks:
@@ -145,6 +152,24 @@ def get_snapshot_at_timestamp(symbol: str, timestamp: float, store) -> dict:
     prices = deque((t["price"] for t in used_ticks), maxlen=50)
     volumes = deque((t["volume"] for t in used_ticks), maxlen=50)
 
+    return _build_snapshot(symbol, last_tick, prices, volumes)
+
+
+def get_history_snapshot_at_timestamp(symbol: str, timestamp: float, store) -> dict:
+    """Snapshot for the closest tick from store.tick_history (decodes only nearby chunks)"""
+    window = store.tick_history.ticks_until_closest(symbol, timestamp, lookback=50)
+    if not window:
+        return None
+
+    ts, price, volume = window[-1]
+    last_tick = {"timestamp": ts, "price": price, "volume": volume}
+    prices = deque((t[1] for t in window), maxlen=50)
+    volumes = deque((t[2] for t in window), maxlen=50)
+
+    return _build_snapshot(symbol, last_tick, prices, volumes)
+
+
+def _build_snapshot(symbol: str, last_tick: dict, prices: deque, volumes: deque) -> dict:
     # 3) Temporary store-like object so we can reuse update_indicators()
     class _TempStore:
         def __init__(self, sym, prices_buf, volumes_buf):
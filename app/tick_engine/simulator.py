@@ -19,6 +19,7 @@ async def simulate_ticks(symbol: str, store):
                 store.timestamps[symbol] = datetime.now().timestamp()
                 store.price_buffers[symbol].append(new_price)
                 store.volume_buffers[symbol].append(volume)
+                store.tick_history.append(symbol, store.timestamps[symbol], new_price, volume)
                 
                 # Update indicators
                 update_indicators(symbol, store)
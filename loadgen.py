@@ -0,0 +1,257 @@
+"""
+Load generator - replays a request mix against the API with asyncio clients.
+
+Against a running instance (the only mode that gives valid saturation numbers):
+    python loadgen.py --base-url http://localhost:8000 --clients 100
+
+In-process (no server needed) - a smoke test only: clients, the ASGI app and
+every tick task share one event loop, so latencies include the generator's own
+scheduling:
+    python loadgen.py --symbols 200 --clients 50 --duration 30
+
+Record the synthesized mix, then replay it later:
+    python loadgen.py --record mix.jsonl
+    python loadgen.py --replay mix.jsonl
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+DEFAULT_MIX = "price=40,pnl=20,indicators=20,snapshot=10,historical=5,subscribe=5"
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight)
+    unknown = set(weights) - set(ENDPOINTS)
+    if unknown:
+        raise ValueError(f"Unknown endpoints in mix: {', '.join(sorted(unknown))}")
+    return weights
+
+
+def _price(symbol: str) -> dict:
+    return {"symbol": symbol, "method": "GET", "path": f"/price/{symbol}"}
+
+
+def _pnl(symbol: str) -> dict:
+    return {"symbol": symbol, "method": "GET", "path": f"/pnl/{symbol}"}
+
+
+def _indicators(symbol: str) -> dict:
+    return {"symbol": symbol, "method": "GET", "path": f"/indicators/{symbol}"}
+
+
+def _snapshot(symbol: str) -> dict:
+    return {"symbol": symbol, "method": "GET", "path": f"/snapshot/{symbol}"}
+
+
+def _historical(symbol: str) -> dict:
+    # Timestamp is resolved at send time as now - ago, so replays hit recent tick history
+    return {"symbol": symbol, "method": "GET", "path": f"/snapshot/{symbol}", "ago": random.uniform(0, 5)}
+
+
+def _subscribe(symbol: str) -> dict:
+    # Every symbol is subscribed in setup(), so drop it first (untimed) and
+    # the measured subscribe really starts a new tick task
+    return {
+        "symbol": symbol,
+        "method": "POST",
+        "path": "/subscribe",
+        "json": {"symbols": [symbol], "mode": "simulation"},
+        "before": {"method": "POST", "path": f"/unsubscribe/{symbol}"},
+    }
+
+
+ENDPOINTS = {
+    "price": _price,
+    "pnl": _pnl,
+    "indicators": _indicators,
+    "snapshot": _snapshot,
+    "historical": _historical,
+    "subscribe": _subscribe,
+}
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, endpoint: str, latency: float, ok: bool):
+        self.latencies[endpoint].append(latency)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def report(self, elapsed: float) -> str:
+        lines = [
+            f"{'endpoint':<12}{'count':>8}{'errors':>8}{'req/s':>10}"
+            f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+        ]
+        all_latencies = []
+        for endpoint in sorted(self.latencies):
+            values = self.latencies[endpoint]
+            all_latencies.extend(values)
+            lines.append(self._row(endpoint, values, self.errors[endpoint], elapsed))
+        lines.append(self._row("TOTAL", all_latencies, sum(self.errors.values()), elapsed))
+        return "\n".join(lines)
+
+    @staticmethod
+    def _row(name: str, values: List[float], errors: int, elapsed: float) -> str:
+        values = sorted(values)
+        if not values:
+            return f"{name:<12}{0:>8}{errors:>8}"
+
+        def pct(p: float) -> float:
+            # Nearest-rank percentile
+            return values[max(math.ceil(p * len(values)) - 1, 0)] * 1000
+
+        return (
+            f"{name:<12}{len(values):>8}{errors:>8}{len(values) / elapsed:>10.1f}"
+            f"{pct(0.50):>10.2f}{pct(0.90):>10.2f}{pct(0.99):>10.2f}{values[-1] * 1000:>10.2f}"
+        )
+
+
+def make_client(base_url: Optional[str]) -> httpx.AsyncClient:
+    if base_url:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        return httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30)
+    # In-process smoke test: requests go straight to the ASGI app and share this
+    # loop with the clients and tick tasks, so latencies are not server latencies
+    from app.main import app
+    # Unhandled app errors come back as 500s instead of aborting the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://loadgen", timeout=30)
+
+
+async def setup(client: httpx.AsyncClient, symbols: List[str]):
+    instruments = [
+        {"symbol": s, "entry_price": round(random.uniform(100, 5000), 2), "quantity": random.randint(1, 500)}
+        for s in symbols
+    ]
+    response = await client.post("/instruments/load", json=instruments)
+    response.raise_for_status()
+    response = await client.post("/subscribe", json={"symbols": symbols, "mode": "simulation"})
+    response.raise_for_status()
+
+
+async def teardown(client: httpx.AsyncClient, symbols: List[str]):
+    for symbol in symbols:
+        await client.post(f"/unsubscribe/{symbol}")
+
+
+async def run_client(
+    client: httpx.AsyncClient,
+    next_request,
+    deadline: float,
+    stats: Stats,
+    recorded: Optional[list],
+):
+    while time.perf_counter() < deadline:
+        req = next_request()
+        if req is None:
+            return
+        if recorded is not None:
+            recorded.append(req)
+        params = {"timestamp": time.time() - req["ago"]} if "ago" in req else None
+        try:
+            if "before" in req:
+                await client.request(req["before"]["method"], req["before"]["path"])
+        except httpx.HTTPError:
+            pass
+        start = time.perf_counter()
+        try:
+            response = await client.request(req["method"], req["path"], params=params, json=req.get("json"))
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        stats.record(req["endpoint"], time.perf_counter() - start, ok)
+
+
+def synthesized(symbols: List[str], weights: Dict[str, float]):
+    names = list(weights)
+    cum = list(weights.values())
+
+    def next_request() -> dict:
+        endpoint = random.choices(names, weights=cum)[0]
+        req = ENDPOINTS[endpoint](random.choice(symbols))
+        req["endpoint"] = endpoint
+        return req
+
+    return next_request
+
+
+def replayed(path: str, loop_forever: bool):
+    with open(path, "r") as f:
+        requests = [json.loads(line) for line in f if line.strip()]
+    state = {"i": 0}
+
+    def next_request() -> Optional[dict]:
+        if state["i"] >= len(requests):
+            if not loop_forever or not requests:
+                return None
+            state["i"] = 0
+        req = requests[state["i"]]
+        state["i"] += 1
+        return req
+
+    return next_request, sorted({r["symbol"] for r in requests})
+
+
+async def main(args):
+    if args.replay:
+        next_request, symbols = replayed(args.replay, args.loop)
+    else:
+        symbols = [f"SYM{i:05d}" for i in range(args.symbols)]
+        next_request = synthesized(symbols, parse_mix(args.mix))
+
+    async with make_client(args.base_url) as client:
+        await setup(client, symbols)
+        print(f"Warming up {len(symbols)} symbols for {args.warmup}s...")
+        await asyncio.sleep(args.warmup)
+
+        stats = Stats()
+        recorded = [] if args.record else None
+        print(f"Running {args.clients} clients for {args.duration}s...")
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(
+            *(run_client(client, next_request, deadline, stats, recorded) for _ in range(args.clients))
+        )
+        elapsed = time.perf_counter() - start
+
+        await teardown(client, symbols)
+
+    print(stats.report(elapsed))
+    if recorded is not None:
+        with open(args.record, "w") as f:
+            for req in recorded:
+                f.write(json.dumps(req) + "\n")
+        print(f"Recorded {len(recorded)} requests to {args.record}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="QuantPulse Engine load generator")
+    parser.add_argument("--base-url", help="Target server (default: in-process app)")
+    parser.add_argument("--symbols", type=int, default=50, help="Simulated symbols")
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to run")
+    parser.add_argument("--warmup", type=float, default=3, help="Seconds of ticks before measuring")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Endpoint weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--record", help="Write the issued requests as JSONL")
+    parser.add_argument("--replay", help="Replay requests from a recorded JSONL file")
+    parser.add_argument("--loop", action="store_true", help="Loop the replayed file until duration ends")
+    parser.add_argument("--seed", type=int, help="Random seed")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    asyncio.run(main(args))
@@ -0,0 +1,91 @@
+"""Test position ledger PnL from fills"""
+from app.data_store.ledger import PositionLedger
+from app.data_store.state import DataStore
+
+
+def test_partial_close_and_flip():
+    ledger = PositionLedger("RELIANCE")
+    ledger.apply_fills([(100.0, 10), (110.0, 10)])
+    assert ledger.quantity == 20
+    assert ledger.avg_price == 105.0
+
+    # Partial close keeps avg cost, books realized PnL
+    ledger.apply_fill(120.0, -5)
+    assert ledger.quantity == 15
+    assert ledger.avg_price == 105.0
+    assert ledger.realized_pnl == 75.0
+    assert ledger.unrealized_pnl(120.0) == 225.0
+
+    # Sell through zero -> short remainder opens at fill price
+    ledger.apply_fill(100.0, -20)
+    assert ledger.quantity == -5
+    assert ledger.avg_price == 100.0
+    assert ledger.realized_pnl == 0.0
+    assert ledger.unrealized_pnl(90.0) == 50.0
+
+    ledger.apply_fill(90.0, 5)
+    assert ledger.quantity == 0
+    assert ledger.avg_price == 0.0
+    assert ledger.realized_pnl == 50.0
+    assert ledger.fill_count == 5
+
+
+def test_store_fills():
+    store = DataStore()
+    store.add_instrument("RELIANCE", 1530.0, 25)
+    store.ltp_cache["RELIANCE"] = 1540.0
+    assert store.get_pnl("RELIANCE") == 250.0
+
+    store.apply_fill("RELIANCE", 1550.0, -10)
+    assert store.instruments["RELIANCE"] == {"entry_price": 1530.0, "quantity": 15}
+    assert store.get_position("RELIANCE")["realized_pnl"] == 200.0
+    assert store.get_pnl("RELIANCE") == 200.0 + 150.0
+
+    # Fill for an unknown symbol opens a new flat instrument
+    store.apply_fill("TCS", 4000.0, 3)
+    assert store.instruments["TCS"] == {"entry_price": 4000.0, "quantity": 3}
+    assert store.get_pnl("TCS") == 0.0
+
+
+def test_reload_sets_opening_position():
+    store = DataStore()
+    store.add_instrument("RELIANCE", 100.0, 10)
+    store.apply_fill("RELIANCE", 102.0, -10)
+    store.ltp_cache["RELIANCE"] = 106.0
+    store.price_buffers["RELIANCE"].append(106.0)
+    lock = store.locks["RELIANCE"]
+
+    # Reposting the same book is idempotent: position is replaced, not added to
+    for _ in range(2):
+        store.add_instrument("RELIANCE", 105.0, 4)
+        position = store.get_position("RELIANCE")
+        assert position["quantity"] == 4
+        assert position["avg_price"] == 105.0
+        assert position["realized_pnl"] == 0.0
+        assert position["fill_count"] == 1
+    assert store.instruments["RELIANCE"] == {"entry_price": 105.0, "quantity": 4}
+
+    # Tick state survives the reload
+    assert store.locks["RELIANCE"] is lock
+    assert store.ltp_cache["RELIANCE"] == 106.0
+    assert list(store.price_buffers["RELIANCE"]) == [106.0]
+
+
+def test_invalid_instrument_leaves_store_untouched():
+    store = DataStore()
+    try:
+        store.add_instrument("A", 0.0, 10)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    assert "A" not in store.instruments
+    assert "A" not in store.ledgers
+    assert "A" not in store.locks
+
+
+if __name__ == "__main__":
+    test_partial_close_and_flip()
+    test_store_fills()
+    test_reload_sets_opening_position()
+    test_invalid_instrument_leaves_store_untouched()
+    print("Ledger tests passed")
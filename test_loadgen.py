@@ -0,0 +1,53 @@
+"""Test load generator mix parsing, percentile report and replay"""
+import json
+import os
+import tempfile
+from loadgen import parse_mix, replayed, Stats
+
+
+def test_parse_mix():
+    assert parse_mix("price=70, pnl=30") == {"price": 70.0, "pnl": 30.0}
+    try:
+        parse_mix("price=70,orders=30")
+        assert False, "expected ValueError"
+    except ValueError as e:
+        assert "orders" in str(e)
+
+
+def test_percentiles():
+    stats = Stats()
+    for ms in range(1, 101):
+        stats.record("price", ms / 1000, ok=ms != 100)
+    stats.record("pnl", 0.001, ok=True)
+    stats.record("pnl", 0.002, ok=True)
+
+    rows = {line.split()[0]: line.split() for line in stats.report(elapsed=2.0).splitlines()[1:]}
+    # endpoint, count, errors, req/s, p50, p90, p99, max
+    assert rows["price"] == ["price", "100", "1", "50.0", "50.00", "90.00", "99.00", "100.00"]
+    assert rows["pnl"] == ["pnl", "2", "0", "1.0", "1.00", "2.00", "2.00", "2.00"]
+    assert rows["TOTAL"][1:3] == ["102", "1"]
+
+
+def test_replay():
+    requests = [
+        {"symbol": "B", "endpoint": "price", "method": "GET", "path": "/price/B"},
+        {"symbol": "A", "endpoint": "pnl", "method": "GET", "path": "/pnl/A"},
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mix.jsonl")
+        with open(path, "w") as f:
+            f.write("\n".join(json.dumps(r) for r in requests) + "\n\n")
+
+        next_request, symbols = replayed(path, loop_forever=False)
+        assert symbols == ["A", "B"]
+        assert [next_request(), next_request(), next_request()] == requests + [None]
+
+        next_request, _ = replayed(path, loop_forever=True)
+        assert [next_request() for _ in range(5)] == requests * 2 + requests[:1]
+
+
+if __name__ == "__main__":
+    test_parse_mix()
+    test_percentiles()
+    test_replay()
+    print("Load generator tests passed")
@@ -0,0 +1,141 @@
+"""Test compressed tick history round-trip and snapshot queries"""
+import random
+import sys
+import threading
+from app.data_store.tick_history import TickHistory
+from app.data_store.state import DataStore
+from app.tick_engine.csv_replay import load_csv, get_snapshot_at_timestamp
+
+
+def _random_ticks(n, start=1764915300.0):
+    rng = random.Random(7)
+    ticks = []
+    ts, price = start, 1530.0
+    for _ in range(n):
+        ts += rng.choice([0.05, 0.1, 0.1, 0.3, 60.0])
+        price = round(price * (1 + rng.uniform(-0.001, 0.001)), rng.choice([2, 6]))
+        ticks.append((round(ts, 3), price, rng.randint(50, 500000)))
+    return ticks
+
+
+def test_round_trip():
+    history = TickHistory(chunk_size=64)
+    ticks = _random_ticks(1000)
+    for tick in ticks:
+        history.append("RELIANCE", *tick)
+
+    assert list(history.iter_ticks("RELIANCE")) == ticks
+    assert len(history.symbols["RELIANCE"].chunks) == 16
+
+    # Range query starting mid-chunk
+    start, end = ticks[100][0], ticks[300][0]
+    assert list(history.iter_ticks("RELIANCE", start, end)) == ticks[100:301]
+
+    # Out-of-order ticks are dropped
+    assert not history.append("RELIANCE", ticks[0][0], 1.0, 1)
+    assert history.stats()["ticks"] == 1000
+
+
+def test_closest_window():
+    history = TickHistory(chunk_size=16)
+    ticks = _random_ticks(200)
+    for tick in ticks:
+        history.append("RELIANCE", *tick)
+
+    window = history.ticks_until_closest("RELIANCE", ticks[120][0] + 0.01, lookback=50)
+    assert window == ticks[71:121]
+    assert history.ticks_until_closest("RELIANCE", 0, lookback=50) == ticks[:1]
+
+
+def test_closest_matches_linear_scan():
+    rng = random.Random(3)
+    ticks = []
+    ts = 1764915300.0
+    for i in range(300):
+        ts = round(ts + rng.choice([0, 0, 0.001, 0.5, 1.0]), 3)
+        ticks.append((ts, 1530.0 + i, i))
+    history = TickHistory(chunk_size=8)
+    for tick in ticks:
+        history.append("RELIANCE", *tick)
+
+    for _ in range(500):
+        target = rng.uniform(ticks[0][0] - 1, ticks[-1][0] + 1)
+        # Same rule as get_snapshot_at_timestamp: first tick with the minimum distance
+        closest = min(range(len(ticks)), key=lambda i: abs(ticks[i][0] - target))
+        expected = ticks[max(closest - 49, 0): closest + 1]
+        assert history.ticks_until_closest("RELIANCE", target, lookback=50) == expected
+
+
+def test_chunk_bounds_use_stored_timestamps():
+    history = TickHistory(chunk_size=2)
+    # Sub-millisecond simulator timestamps round up into the stored value
+    for ts in (1000.0001, 1000.0004, 1000.0006, 1000.0009):
+        history.append("SIM", ts, 100.0, 1)
+    assert history.symbols["SIM"].chunks[1].start_ts == 1000.001
+    assert len(list(history.iter_ticks("SIM", end=1000.0))) == 2
+    assert len(list(history.iter_ticks("SIM", end=1000.001))) == 4
+    assert len(list(history.iter_ticks("SIM", start=1000.001))) == 2
+
+
+def test_dropped_ticks_counted():
+    history = TickHistory()
+    history.append("RELIANCE", 1000.0, 100.0, 1)
+    history.append("RELIANCE", 1001.0, 100.0, 1)
+    assert not history.append("RELIANCE", 1000.5, 100.0, 1)
+    assert not history.append("RELIANCE", 999.0, 100.0, 1)
+    assert history.last_timestamp("RELIANCE") == 1001.0
+    assert history.stats()["dropped"] == {"RELIANCE": 2}
+
+
+def test_decode_while_appending():
+    history = TickHistory(chunk_size=4096)
+    ticks = _random_ticks(3000)
+    errors = []
+    done = threading.Event()
+
+    def reader():
+        # Decoding the open head chunk must always yield a consistent prefix
+        while not done.is_set():
+            try:
+                decoded = list(history.symbols["RELIANCE"].chunks[-1])
+                assert decoded == ticks[:len(decoded)]
+            except Exception as e:
+                errors.append(e)
+
+    history.append("RELIANCE", *ticks[0])
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for tick in ticks[1:]:
+            history.append("RELIANCE", *tick)
+    finally:
+        done.set()
+        thread.join()
+        sys.setswitchinterval(old_interval)
+    assert not errors, errors[:3]
+
+
+def test_snapshot_matches_csv():
+    store = DataStore()
+    load_csv("RELIANCE.csv", store)
+    for tick in store.csv_data["RELIANCE"]:
+        store.tick_history.append("RELIANCE", tick["timestamp"], tick["price"], tick["volume"])
+
+    target = store.csv_data["RELIANCE"][200]["timestamp"] + 20
+    from_csv = get_snapshot_at_timestamp("RELIANCE", target, store)
+    del store.csv_data["RELIANCE"]
+    from_history = get_snapshot_at_timestamp("RELIANCE", target, store)
+    assert from_history == from_csv
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_closest_window()
+    test_closest_matches_linear_scan()
+    test_chunk_bounds_use_stored_timestamps()
+    test_dropped_ticks_counted()
+    test_decode_while_appending()
+    test_snapshot_matches_csv()
+    print("Tick history tests passed")